@@ -736,7 +736,7 @@ def install_deps_ubuntu(args):
          "cmake", "zlib1g-dev", "libexpat1-dev", "libxml2-utils"])
 
     ensure_venv("build/venv")
-    install_deps_pip(extra_packages=["pytest", "pytest-cov"])
+    install_deps_pip(extra_packages=["pytest", "pytest-cov", "pytest-xdist"])
 
 
 def install_deps_centos(args):
@@ -946,7 +946,8 @@ def test_cyexiv2_inplace(args):
     with restore_environ():
         augment_path("PYTHONPATH", os.path.join(os.getcwd(), "src"))
         augment_path("LD_LIBRARY_PATH", "/usr/local/lib")
-        run(["pytest", "--doctest-modules", "--junitxml=test-results.xml",
+        run(["pytest", "-n", "auto", "--dist", "loadgroup",
+             "--doctest-modules", "--junitxml=test-results.xml",
              "--cov=pyexiv2", "--cov-report=xml"])
 
         normalize_cov_xml("coverage.xml")
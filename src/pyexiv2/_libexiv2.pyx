@@ -424,6 +424,9 @@ cdef class _Image:
             preinc(p)
         return rv
 
+    def _xmpCount(self):
+        return self._inner.getXmpData()[0].count()
+
     def _getXmpTag(self, key):
         cdef _XmpTag tag = _XmpTag()
         self._inner.getXmpTag(to_bytes(key), tag._inner)
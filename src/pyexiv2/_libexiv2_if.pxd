@@ -102,6 +102,7 @@ cdef extern from "_libexiv2_if.hpp":
 
         iterator begin()
         iterator end()
+        long count()
 
     cdef cppclass ExifTag:
         ExifTag()
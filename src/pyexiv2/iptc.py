@@ -34,7 +34,7 @@ import time
 
 from . import _libexiv2
 from .utils import (
-    DateTimeFormatter, FixedOffset, ListenerInterface, NotifyingList
+    _fixed_offset, DateTimeFormatter, ListenerInterface, NotifyingList
 )
 
 
@@ -299,7 +299,7 @@ class IptcTag(ListenerInterface):
 
             gd = match.groupdict()
             try:
-                tzinfo = FixedOffset(
+                tzinfo = _fixed_offset(
                     gd['sign'], int(gd['ohours']), int(gd['ominutes'])
                 )
             except TypeError:
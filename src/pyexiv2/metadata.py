@@ -29,6 +29,7 @@ Provide the ImageMetadata class.
 """
 
 import codecs
+import encodings.aliases
 import os
 from errno import ENOENT
 from itertools import chain
@@ -45,6 +46,32 @@ except ImportError:
     from collections import MutableMapping
 
 
+#: ISO 2022 escape sequences for the character sets that can be declared
+#: in Iptc.Envelope.CharacterSet, keyed by codec name.
+_IPTC_CHARSETS = {'utf-8': '\x1b%G'}
+
+
+def _build_iptc_charset_aliases():
+    """Map the names under which the standard library knows each codec in
+    _IPTC_CHARSETS, lowercased and with hyphens replaced by underscores,
+    to the codec name.
+
+    Only the aliases of the handled codecs are collected: looking up every
+    alias in the codec registry would import all the codec modules.
+    """
+    modules = {name.replace('-', '_'): name for name in _IPTC_CHARSETS}
+    table = dict(modules)
+    for alias, module in encodings.aliases.aliases.items():
+        if module in modules:
+            table[alias] = modules[module]
+    return table
+
+
+#: Resolving a charset name found in this table does not require a lookup
+#: in the codec registry.
+_IPTC_CHARSET_ALIASES = _build_iptc_charset_aliases()
+
+
 class ImageMetadata(MutableMapping):
     """A container for all the metadata embedded in an image.
 
@@ -106,6 +133,12 @@ class ImageMetadata(MutableMapping):
         It is necessary to call this method once before attempting to access
         the metadata (an exception will be raised if trying to access metadata
         before calling this method).
+
+        libexiv2 parses the EXIF, IPTC and XMP metadata in a single pass,
+        so there is no way to read only some of them.  Everything this
+        class does on top of that (listing the keys of a family, creating
+        tag objects) is deferred until first use, so a family that is
+        never accessed costs nothing more than its share of the parse.
         """
         if self.__image is None:
             self.__image = self._instantiate_image(self.filename)
@@ -179,6 +212,17 @@ class ImageMetadata(MutableMapping):
 
         return self._keys['xmp']
 
+    def xmp_count(self):
+        """Return the number of the available XMP tags.
+
+        This is ``len(self.xmp_keys)``, without building the list of keys
+        if it hasn't been built yet.
+        """
+        if self._keys['xmp'] is None:
+            return self._image._xmpCount()
+
+        return len(self._keys['xmp'])
+
     def _get_exif_tag(self, key):
         """Return the EXIF tag for the given key.
 
@@ -244,6 +288,33 @@ class ImageMetadata(MutableMapping):
         else:
             raise KeyError(key)
 
+    def get_tags(self, keys):
+        """Return a dictionary mapping each of the given keys to its
+        metadata tag.
+
+        This is equivalent to ``{key: self[key] for key in keys}``, but
+        dispatches on the family of each key only once per family.
+
+        Raise KeyError if any of the tags doesn't exist
+
+        Args:
+        keys -- an iterable of metadata keys, in the same form as
+                accepted by ``__getitem__``
+        """
+        getters = {}
+        tags = {}
+        for key in keys:
+            family = key.split('.')[0].lower()
+            try:
+                getter = getters[family]
+            except KeyError:
+                if family not in ('exif', 'iptc', 'xmp'):
+                    raise KeyError(key)
+                getter = getters[family] = \
+                    getattr(self, '_get_%s_tag' % family)
+            tags[key] = getter(key)
+        return tags
+
     def _set_exif_tag(self, key, tag_or_value):
         """Set an EXIF tag. If the tag already exists, its value is overwritten.
 
@@ -507,17 +578,20 @@ class ImageMetadata(MutableMapping):
             self._del_iptc_charset()
             return
 
-        try:
-            name = codecs.lookup(charset).name
-        except LookupError as error:
-            raise ValueError(error)
+        name = None
+        if isinstance(charset, str):
+            name = _IPTC_CHARSET_ALIASES.get(charset.lower().replace('-', '_'))
 
-        else:
-            charsets = {'utf-8': '\x1b%G'}
+        if name is None:
             try:
-                self['Iptc.Envelope.CharacterSet'] = (charsets[name], )
-            except KeyError:
-                raise ValueError('Unhandled charset: %s' % name)
+                name = codecs.lookup(charset).name
+            except LookupError as error:
+                raise ValueError(error)
+
+        try:
+            self['Iptc.Envelope.CharacterSet'] = (_IPTC_CHARSETS[name], )
+        except KeyError:
+            raise ValueError('Unhandled charset: %s' % name)
 
     def _del_iptc_charset(self):
         try:
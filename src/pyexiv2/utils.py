@@ -29,6 +29,7 @@ Utilitary classes and functions.
 """
 
 import datetime
+import functools
 import re
 from fractions import Fraction
 
@@ -107,6 +108,16 @@ class FixedOffset(datetime.tzinfo):
             (self.minutes == other.minutes)
 
 
+@functools.lru_cache(maxsize=256)
+def _fixed_offset(sign='+', hours=0, minutes=0):
+    """Memoized :class:`FixedOffset` constructor, for parsing dates and
+    times.  Tags tend to repeat the same few time zones, so one instance
+    per offset is shared between all the values parsed with it: the
+    returned tzinfo must not be modified.
+    """
+    return FixedOffset(sign, hours, minutes)
+
+
 def datetime_is_midnight_utc(d):
     """Returns true if the datetime D represents midnight UTC.
 
@@ -122,6 +133,10 @@ def datetime_is_midnight_utc(d):
     return True
 
 
+# The decimal representation of every byte value, for string_to_undefined.
+_BYTE_TO_DEC = tuple(str(i) for i in range(256))
+
+
 def undefined_to_string(undefined):
     """Convert an undefined string into its corresponding sequence of bytes.
 
@@ -134,11 +149,16 @@ def undefined_to_string(undefined):
     undefined -- an undefined string
 
     Return: the corresponding decoded string
+
+    Raise ValueError: if the string is not a sequence of byte values
+                      separated by single spaces
     """
     if not undefined:
         return ''
 
-    return ''.join([chr(int(x)) for x in undefined.rstrip().split(' ')])
+    # Building a bytes object from the codes, and decoding it in one go,
+    # keeps the per-byte work in C and rejects codes above 255.
+    return bytes(map(int, undefined.rstrip().split(' '))).decode('latin-1')
 
 
 def string_to_undefined(sequence):
@@ -149,11 +169,18 @@ def string_to_undefined(sequence):
     The Undefined type is part of the EXIF specification.
 
     Args:
-    sequence -- a sequence of bytes
+    sequence -- a sequence of bytes, either as a bytes object or as
+                a string of characters in the Latin-1 range
 
     Return: the corresponding undefined string
+
+    Raise UnicodeEncodeError: if the string contains a character outside
+                              of the Latin-1 range
     """
-    return " ".join([str(ord(s)) for s in sequence])
+    if isinstance(sequence, str):
+        sequence = sequence.encode('latin-1')
+
+    return " ".join([_BYTE_TO_DEC[b] for b in sequence])
 
 
 def is_fraction(obj):
@@ -163,6 +190,9 @@ def is_fraction(obj):
     return isinstance(obj, Fraction)
 
 
+_fraction_re = re.compile(r'(?P<numerator>-?\d+)/(?P<denominator>\d+)')
+
+
 def match_string(string):
     """Match a string against the expected format for a :class:`Fraction`
     (``[-]numerator/denominator``) and return the numerator and denominator
@@ -175,8 +205,7 @@ def match_string(string):
 
     Raise ValueError: if the format of the string is invalid
     """
-    format_re = re.compile(r'(?P<numerator>-?\d+)/(?P<denominator>\d+)')
-    match = format_re.match(string)
+    match = _fraction_re.match(string)
     if match is None:
         raise ValueError('Invalid format for a rational: %s' % string)
 
@@ -184,6 +213,15 @@ def match_string(string):
     return (int(gd['numerator']), int(gd['denominator']))
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_frac(string):
+    """Memoized :func:`match_string`, for the string form of
+    :func:`make_fraction`.  Tags tend to repeat the same few rational
+    values, so most strings only need to be matched once.
+    """
+    return match_string(string)
+
+
 def make_fraction(*args):
     """Make a fraction.
 
@@ -191,7 +229,7 @@ def make_fraction(*args):
                       fraction
     """
     if len(args) == 1:
-        numerator, denominator = match_string(args[0])
+        numerator, denominator = _parse_frac(args[0])
 
     elif len(args) == 2:
         numerator = args[0]
@@ -229,6 +267,9 @@ class ListenerInterface(object):
     Interface that an object that wants to listen to changes on another object
     should implement.
     """
+    # Empty, so that subclasses may declare __slots__ of their own.
+    __slots__ = ()
+
     def contents_changed(self):
         """
         React on changes on the object observed.
@@ -249,9 +290,26 @@ class NotifyingList(list):
     # file:///usr/share/doc/python2.5/html/lib/typesseq-mutable.html
     # http://docs.python.org/reference/datamodel.html#additional-methods-for-emulation-of-sequence-types
 
-    def __init__(self, items=[]):
-        super(NotifyingList, self).__init__(items)
-        self._listeners = set()
+    # A NotifyingList with no listeners is really an instance of the
+    # _QuietNotifyingList subclass below, whose mutating methods are
+    # those of the plain list type.  register_listener() and
+    # unregister_listener() switch the class of the instance back and
+    # forth as the set of listeners becomes non-empty or empty.
+    def __new__(cls, *args, **kwargs):
+        if cls is NotifyingList:
+            cls = _QuietNotifyingList
+        return list.__new__(cls, *args, **kwargs)
+
+    def __init__(self, items=()):
+        list.__init__(self, items)
+        # The listeners are kept in a tuple which is replaced, never
+        # modified, when a listener is (un)registered.  A notification
+        # in progress is therefore never disturbed by a listener that
+        # (un)registers itself.  _notify_fns holds the listeners' bound
+        # contents_changed methods, in the same order, so that notifying
+        # does not have to look them up again every time.
+        self._listeners = ()
+        self._notify_fns = ()
 
     def register_listener(self, listener):
         """Register a new listener to be notified of changes.
@@ -259,7 +317,11 @@ class NotifyingList(list):
         Args:
         listener -- any ListenerInterface instance that listens for changes
         """
-        self._listeners.add(listener)
+        if listener not in self._listeners:
+            self._listeners = self._listeners + (listener,)
+            self._notify_fns = self._notify_fns + (listener.contents_changed,)
+            if type(self) is _QuietNotifyingList:
+                self.__class__ = NotifyingList
 
     def unregister_listener(self, listener):
         """Unregister a previously registered listener.
@@ -269,63 +331,119 @@ class NotifyingList(list):
 
         Raise KeyError: if the listener was not previously registered
         """
-        self._listeners.remove(listener)
+        listeners = self._listeners
+        try:
+            i = listeners.index(listener)
+        except ValueError:
+            raise KeyError(listener)
+
+        self._listeners = listeners[:i] + listeners[i+1:]
+        fns = self._notify_fns
+        self._notify_fns = fns[:i] + fns[i+1:]
+        if not self._listeners and type(self) is NotifyingList:
+            self.__class__ = _QuietNotifyingList
 
     def _notify_listeners(self, *args):
-        for listener in self._listeners:
-            listener.contents_changed(*args)
-
+        for fn in self._notify_fns:
+            fn(*args)
+
+    # copy, deepcopy and pickle.  The list is rebuilt as
+    # NotifyingList(items), which has no listeners yet, so rebuilding it
+    # notifies no one; __setstate__ then restores the listeners and
+    # switches to the notifying class if there are any.
+    def __reduce_ex__(self, protocol):
+        cls = type(self)
+        if cls is _QuietNotifyingList:
+            cls = NotifyingList
+        return (cls, (list(self),), self.__dict__)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._listeners and type(self) is _QuietNotifyingList:
+            self.__class__ = NotifyingList
+
+    # index may be an integer or a slice: the list methods take care of
+    # negative indices, extended slices and arbitrary iterables, so
+    # there is no need for the __setslice__/__delslice__ of Python 2.
     def __setitem__(self, index, item):
-        super(NotifyingList, self).__setitem__(index, item)
+        list.__setitem__(self, index, item)
         self._notify_listeners()
 
     def __delitem__(self, index):
-        super(NotifyingList, self).__delitem__(index)
+        list.__delitem__(self, index)
         self._notify_listeners()
 
     def append(self, item):
-        super(NotifyingList, self).append(item)
+        list.append(self, item)
         self._notify_listeners()
 
     def extend(self, items):
-        super(NotifyingList, self).extend(items)
+        list.extend(self, items)
         self._notify_listeners()
 
     def insert(self, index, item):
-        super(NotifyingList, self).insert(index, item)
+        list.insert(self, index, item)
         self._notify_listeners()
 
     def pop(self, index=None):
         if index is None:
-            item = super(NotifyingList, self).pop()
+            item = list.pop(self)
         else:
-            item = super(NotifyingList, self).pop(index)
+            item = list.pop(self, index)
         self._notify_listeners()
         return item
 
     def remove(self, item):
-        super(NotifyingList, self).remove(item)
+        list.remove(self, item)
         self._notify_listeners()
 
     def reverse(self):
-        super(NotifyingList, self).reverse()
+        list.reverse(self)
         self._notify_listeners()
 
     def sort(self, key=None, reverse=False):
-        super(NotifyingList, self).sort(key=key, reverse=reverse)
+        list.sort(self, key=key, reverse=reverse)
         self._notify_listeners()
 
     def __iadd__(self, other):
-        self = super(NotifyingList, self).__iadd__(other)
+        list.__iadd__(self, other)
         self._notify_listeners()
         return self
 
     def __imul__(self, coefficient):
-        self = super(NotifyingList, self).__imul__(coefficient)
+        list.__imul__(self, coefficient)
         self._notify_listeners()
         return self
 
 
+class _QuietNotifyingList(NotifyingList):
+    """A NotifyingList that has no listeners, and so can skip the
+    notification step of all its mutating methods.
+
+    Never instantiate this class directly: NotifyingList does it, and
+    switches to and from it as needed.
+    """
+    __setitem__ = list.__setitem__
+    __delitem__ = list.__delitem__
+    append = list.append
+    extend = list.extend
+    insert = list.insert
+    remove = list.remove
+    reverse = list.reverse
+    __iadd__ = list.__iadd__
+    __imul__ = list.__imul__
+
+    # Not list.pop and list.sort: those don't accept the same arguments
+    # as NotifyingList.pop and NotifyingList.sort.
+    def pop(self, index=None):
+        if index is None:
+            return list.pop(self)
+        return list.pop(self, index)
+
+    def sort(self, key=None, reverse=False):
+        list.sort(self, key=key, reverse=reverse)
+
+
 class GPSCoordinate(object):
     """A class representing GPS coordinates (e.g. a latitude or a longitude).
 
@@ -604,11 +722,12 @@ class DateTimeFormatter(object):
                     (d.year, d.month, d.day, d.hour, d.minute, d.second, tz)
 
             else:
-                r = '%04d-%02d-%02dT%02d:%02d:%02d.' % \
-                    (d.year, d.month, d.day, d.hour, d.minute, d.second)
-                r += str(int(d.microsecond) / 1E6)[2:]
-                r += tz
-                return r
+                # The decimal fraction of the seconds, without trailing
+                # zeroes.  Formatting the integer keeps it exact, where
+                # going through a float would print 1µs as '1e-06'.
+                return '%04d-%02d-%02dT%02d:%02d:%02d.%s%s' % \
+                    (d.year, d.month, d.day, d.hour, d.minute, d.second,
+                     ('%06d' % d.microsecond).rstrip('0'), tz)
 
         elif isinstance(d, datetime.date):
             return '%04d-%02d-%02d' % (d.year, d.month, d.day)
@@ -29,11 +29,10 @@ XMP specific code.
 """
 
 import datetime
-import re
 
 from . import _libexiv2
 from .utils import (
-    FixedOffset, is_fraction, make_fraction, GPSCoordinate, DateTimeFormatter
+    _fixed_offset, is_fraction, make_fraction, GPSCoordinate, DateTimeFormatter
 )
 
 
@@ -55,6 +54,219 @@ class XmpValueError(ValueError):
                (self.type_, self.value)
 
 
+def _date_field(value, start, end):
+    """Return the decimal number in value[start:end], which must consist
+    of exactly end - start digits.
+
+    Raise ValueError: if it doesn't
+    """
+    field = value[start:end]
+    if len(field) != end - start or not field.isdecimal():
+        raise ValueError(value)
+    return int(field)
+
+
+def _parse_xmp_date(value):
+    """Parse the raw value of an XMP Date tag.
+
+    strptime is not flexible enough to handle all the valid forms, which
+    are ``YYYY[-MM[-DD[Thh:mm[:ss[.s+]][TZD]]]]``, where ``TZD`` is either
+    ``Z`` or ``(+|-)hh:mm``.  Every field but the decimal fraction of the
+    seconds has a fixed width, so the value is scanned by position.
+
+    Args:
+    value -- the raw value, a string
+
+    Return: a :class:`datetime.date` if the value has no time part, else
+            a :class:`datetime.datetime`, naive if there is no ``TZD``
+
+    Raise ValueError: if the value is not a valid XMP date
+    """
+    if not isinstance(value, str):
+        raise ValueError(value)
+
+    n = len(value)
+    year = _date_field(value, 0, 4)
+    if n == 4:
+        return datetime.date(year, 1, 1)
+
+    if value[4] != '-':
+        raise ValueError(value)
+    month = _date_field(value, 5, 7)
+    if n == 7:
+        return datetime.date(year, month, 1)
+
+    if value[7] != '-':
+        raise ValueError(value)
+    day = _date_field(value, 8, 10)
+    if n == 10:
+        return datetime.date(year, month, day)
+
+    if value[10] != 'T' or value[13:14] != ':':
+        raise ValueError(value)
+    hours = _date_field(value, 11, 13)
+    minutes = _date_field(value, 14, 16)
+
+    pos = 16
+    seconds = microseconds = 0
+    if value[16:17] == ':':
+        seconds = _date_field(value, 17, 19)
+        pos = 19
+        if value[19:20] == '.':
+            pos = 20
+            while pos < n and value[pos].isdecimal():
+                pos += 1
+            if pos == 20:
+                raise ValueError(value)
+            # Keep the first six digits of the fraction, padded with
+            # zeroes; going through a float would not be exact.
+            microseconds = int(value[20:pos][:6].ljust(6, '0'))
+
+    tzd = value[pos:]
+    if not tzd:
+        # No time zone designator: a local time.
+        tzinfo = None
+
+    elif tzd == 'Z':
+        tzinfo = _fixed_offset()
+
+    elif len(tzd) == 6 and tzd[0] in '+-' and tzd[3] == ':':
+        tzinfo = _fixed_offset(
+            tzd[0], _date_field(tzd, 1, 3), _date_field(tzd, 4, 6)
+        )
+
+    else:
+        raise ValueError(value)
+
+    return datetime.datetime(
+        year, month, day, hours, minutes, seconds, microseconds, tzinfo
+    )
+
+
+def _boolean_to_python(value):
+    if value == 'True':
+        return True
+    elif value == 'False':
+        return False
+    raise ValueError(value)
+
+
+def _mimetype_to_python(value):
+    if value.count('/') != 1:
+        raise ValueError(value)
+    return tuple(value.split('/', 1))
+
+
+def _rational_to_python(value):
+    try:
+        return make_fraction(value)
+    except ZeroDivisionError:
+        raise ValueError(value)
+
+
+def _text_to_python(value):
+    if isinstance(value, bytes):
+        # UnicodeDecodeError is a ValueError.
+        return value.decode('utf-8')
+
+    elif isinstance(value, str):
+        return value
+
+    raise ValueError(value)
+
+
+def _boolean_to_string(value):
+    if isinstance(value, bool):
+        return str(value)
+    raise ValueError(value)
+
+
+def _date_to_string(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return DateTimeFormatter.xmp(value)
+    raise ValueError(value)
+
+
+def _gpscoordinate_to_string(value):
+    if isinstance(value, GPSCoordinate):
+        return str(value)
+    raise ValueError(value)
+
+
+def _integer_to_string(value):
+    if isinstance(value, int):
+        return str(value)
+    raise ValueError(value)
+
+
+def _mimetype_to_string(value):
+    if isinstance(value, tuple) and len(value) == 2:
+        return '/'.join(value)
+    raise ValueError(value)
+
+
+def _rational_to_string(value):
+    if is_fraction(value):
+        return str(value)
+    raise ValueError(value)
+
+
+def _text_to_string(value):
+    if isinstance(value, str):
+        # UnicodeEncodeError is a ValueError.
+        return value.encode('utf-8')
+
+    elif isinstance(value, bytes):
+        return value
+
+    raise ValueError(value)
+
+
+def _undefined_to_string(value):
+    if isinstance(value, str):
+        return value.encode('utf-8')
+
+    elif isinstance(value, (datetime.date, datetime.datetime)):
+        return DateTimeFormatter.xmp(value)
+
+    raise NotImplementedError('XMP conversion for type []')
+
+
+#: Converters from a raw value to its python type, by simple XMP type.
+#: They raise ValueError when the value is invalid for the type.
+_PY_CONVERTERS = {
+    'Boolean': _boolean_to_python,
+    'Date': _parse_xmp_date,
+    'GPSCoordinate': GPSCoordinate.from_string,
+    'Integer': int,
+    'MIMEType': _mimetype_to_python,
+    'Rational': _rational_to_python,
+    'AgentName': _text_to_python,
+    'ProperName': _text_to_python,
+    'Text': _text_to_python,
+    'URI': _text_to_python,
+    'URL': _text_to_python,
+}
+
+#: Converters from a python value to its raw value, by simple XMP type.
+#: They raise ValueError when the value is invalid for the type.
+_STR_CONVERTERS = {
+    'Boolean': _boolean_to_string,
+    'Date': _date_to_string,
+    'GPSCoordinate': _gpscoordinate_to_string,
+    'Integer': _integer_to_string,
+    'MIMEType': _mimetype_to_string,
+    'Rational': _rational_to_string,
+    'AgentName': _text_to_string,
+    'ProperName': _text_to_string,
+    'Text': _text_to_string,
+    'URI': _text_to_string,
+    'URL': _text_to_string,
+    # Undefined type
+    '': _undefined_to_string,
+}
+
+
 class XmpTag(object):
     """Define an XMP tag.
 
@@ -80,32 +292,6 @@ class XmpTag(object):
     - XPath: *[not implemented yet]*
     """
 
-    # strptime is not flexible enough to handle all valid Date
-    # formats, we use a custom regular expression
-    _date_re = re.compile(
-        r'''\A
-                  (?P<year>    \d{4} )
-            (?: - (?P<month>   \d{2} )
-                (?: - (?P<day> \d{2} )
-                    (?: T (?P<time>
-                                (?P<hours>   \d{2} )
-                             :  (?P<minutes> \d{2} )
-                         (?: :  (?P<seconds> \d{2} )
-                             (?: \. (?P<decimal> \d+ ) )?
-                         )?
-                         (?P<tzd>
-                             Z
-                           |   (?P<sign>      \+|- )
-                               (?P<ohours>   \d{2} )
-                             : (?P<ominutes> \d{2} )
-                          )?
-                        )
-                    )?
-                )?
-            )?
-        \Z''', re.X
-    )
-
     def __init__(self, key, value=None, _tag=None):
         """The tag can be initialized with an optional value which expected
         type depends on the XMP type of the tag.
@@ -121,6 +307,7 @@ class XmpTag(object):
         else:
             self._tag = _libexiv2._XmpTag(key)
 
+        self._type = None
         self._raw_value = None
         self._value = None
         self._value_cookie = False
@@ -165,7 +352,11 @@ class XmpTag(object):
         """The XMP type of the tag.
 
         """
-        return self._tag._getType()
+        # The type only depends on the key, but looking it up in libexiv2
+        # walks the property tables, and the conversions need it often.
+        if self._type is None:
+            self._type = self._tag._getType()
+        return self._type
 
     @property
     def name(self):
@@ -222,11 +413,9 @@ class XmpTag(object):
             type_ = self.type[4:]
 
             if type_.lower().startswith('closed choice of'):
-                type_ = type[17:]
+                type_ = type_[17:]
 
-            self._value = [
-                self._convert_to_python(v, type_) for v in self._raw_value
-            ]
+            self._value = self._convert_many_to_python(self._raw_value, type_)
 
         elif self.type == 'Lang Alt':
             self._value = {}
@@ -311,141 +500,48 @@ class XmpTag(object):
 
         Raise XmpValueError: if the conversion fails
         """
-        if type_ == 'Boolean':
-            if value == 'True':
-                return True
-
-            elif value == 'False':
-                return False
-
-            else:
-                raise XmpValueError(value, type_)
-
-        elif type_ == 'Colorant':
-            # TODO
+        try:
+            convert = _PY_CONVERTERS[type_]
+        except KeyError:
+            # TODO: Colorant, Dimensions, Font, Locale (RFC 3066), Real,
+            # Thumbnail, XPath
             raise NotImplementedError('XMP conversion for type [%s]' % type_)
 
-        elif type_ == 'Date':
-            match = self._date_re.match(value)
-            if match is None:
-                raise XmpValueError(value, type_)
-
-            gd = match.groupdict()
-            if gd['month'] is not None:
-                month = int(gd['month'])
-
-            else:
-                month = 1
-
-            if gd['day'] is not None:
-                day = int(gd['day'])
-
-            else:
-                day = 1
-
-            if gd['time'] is None:
-                try:
-                    return datetime.date(int(gd['year']), month, day)
-                except ValueError:
-                    raise XmpValueError(value, type_)
-
-            else:
-                if gd['minutes'] is None:
-                    # Malformed time
-                    raise XmpValueError(value, type_)
-
-                if gd['seconds'] is not None:
-                    seconds = int(gd['seconds'])
-
-                else:
-                    seconds = 0
-
-                if gd['decimal'] is not None:
-                    microseconds = int(float('0.%s' % gd['decimal']) * 1E6)
-
-                else:
-                    microseconds = 0
-
-                if gd['tzd'] == 'Z':
-                    tzinfo = FixedOffset()
+        try:
+            return convert(value)
+        except ValueError:
+            raise XmpValueError(value, type_)
 
-                else:
-                    tzinfo = FixedOffset(
-                        gd['sign'], int(gd['ohours']), int(gd['ominutes'])
-                    )
+    def _convert_many_to_python(self, values, type_):
+        """Convert raw values that share the same type to their
+        corresponding python type.
 
-                try:
-                    return datetime.datetime(
-                        int(gd['year']), month, day, int(gd['hours']),
-                        int(gd['minutes']), seconds, microseconds, tzinfo
-                    )
-                except ValueError:
-                    raise XmpValueError(value, type_)
-
-        elif type_ == 'Dimensions':
-            # TODO
-            raise NotImplementedError('XMP conversion for type [%s]' % type_)
+        The converter is looked up once for the whole batch.
 
-        elif type_ == 'Font':
-            # TODO
-            raise NotImplementedError('XMP conversion for type [%s]' % type_)
+        Args:
+        values -- a list of raw values to be converted
+        type_ -- the simple type of the raw values
 
-        elif type_ == 'GPSCoordinate':
-            try:
-                return GPSCoordinate.from_string(value)
-            except ValueError:
-                raise XmpValueError(value, type_)
+        Return: a list of the values converted to their python type
 
-        elif type_ == 'Integer':
-            try:
-                return int(value)
-            except ValueError:
-                raise XmpValueError(value, type_)
+        Raise XmpValueError: if the conversion of a value fails
+        """
+        if not values:
+            # Nothing to convert, even for a type with no converter yet.
+            return []
 
-        elif type_ == 'Locale':
-            # TODO
-            # See RFC 3066
+        try:
+            convert = _PY_CONVERTERS[type_]
+        except KeyError:
             raise NotImplementedError('XMP conversion for type [%s]' % type_)
 
-        elif type_ == 'MIMEType':
-            if value.count('/') != 1:
-                raise XmpValueError(value, type_)
+        result = []
+        for value in values:
             try:
-                return tuple(value.split('/', 1))
+                result.append(convert(value))
             except ValueError:
                 raise XmpValueError(value, type_)
-
-        elif type_ == 'Rational':
-            try:
-                return make_fraction(value)
-            except (ValueError, ZeroDivisionError):
-                raise XmpValueError(value, type_)
-
-        elif type_ == 'Real':
-            # TODO
-            raise NotImplementedError('XMP conversion for type [%s]' % type_)
-
-        elif type_ in ('AgentName', 'ProperName', 'Text', 'URI', 'URL'):
-            if isinstance(value, bytes):
-                try:
-                    return value.decode('utf-8')
-                except UnicodeEncodeError:
-                    raise XmpValueError(value, type_)
-
-            elif isinstance(value, str):
-                return value
-
-            raise XmpValueError(value, type_)
-
-        elif type_ == 'Thumbnail':
-            # TODO
-            raise NotImplementedError('XMP conversion for type [%s]' % type_)
-
-        elif type_ == 'XPath':
-            # TODO
-            raise NotImplementedError('XMP conversion for type [%s]' % type_)
-
-        raise NotImplementedError('XMP conversion for type [%s]' % type_)
+        return result
 
     def _convert_to_string(self, value, type_):
         """Convert a value to its corresponding string representation.
@@ -458,72 +554,16 @@ class XmpTag(object):
 
         Raise XmpValueError: if the conversion fails
         """
-        if type_ == 'Boolean':
-            if isinstance(value, bool):
-                return str(value)
-            else:
-                raise XmpValueError(value, type_)
-
-        elif type_ == 'Date':
-            if isinstance(value, (datetime.date, datetime.datetime)):
-                return DateTimeFormatter.xmp(value)
-
-            else:
-                raise XmpValueError(value, type_)
-
-        elif type_ == 'GPSCoordinate':
-            if isinstance(value, GPSCoordinate):
-                return str(value)
-
-            else:
-                raise XmpValueError(value, type_)
-
-        elif type_ == 'Integer':
-            if isinstance(value, int):
-                return str(value)
-
-            else:
-                raise XmpValueError(value, type_)
-
-        elif type_ == 'MIMEType':
-            if isinstance(value, tuple) and len(value) == 2:
-                return '/'.join(value)
-
-            else:
-                raise XmpValueError(value, type_)
-
-        elif type_ in ('AgentName', 'ProperName', 'Text', 'URI', 'URL'):
-            if isinstance(value, str):
-                try:
-                    return value.encode('utf-8')
-                except UnicodeEncodeError:
-                    raise XmpValueError(value, type_)
-
-            elif isinstance(value, bytes):
-                return value
+        try:
+            convert = _STR_CONVERTERS[type_]
+        except KeyError:
+            raise NotImplementedError('XMP conversion for type [%s]' % type_)
 
+        try:
+            return convert(value)
+        except ValueError:
             raise XmpValueError(value, type_)
 
-        elif type_ == 'Rational':
-            if is_fraction(value):
-                return str(value)
-
-            else:
-                raise XmpValueError(value, type_)
-
-        elif type_ == '':
-            # Undefined type
-            if isinstance(value, str):
-                try:
-                    return value.encode('utf-8')
-                except UnicodeEncodeError:
-                    raise XmpValueError(value, type_)
-
-            elif isinstance(value, (datetime.date, datetime.datetime)):
-                return DateTimeFormatter.xmp(value)
-
-        raise NotImplementedError('XMP conversion for type [%s]' % type_)
-
     def __str__(self):
         """Return a string representation of the XMP tag for debugging purposes
 
@@ -544,6 +584,7 @@ class XmpTag(object):
     def __setstate__(self, state):
         key, raw_value = state
         self._tag = _libexiv2._XmpTag(key)
+        self._type = None
         self.raw_value = raw_value
 
 
@@ -25,10 +25,50 @@
 #
 # ******************************************************************************
 
-"""Local pytest hooks for the cyexiv2 testsuite."""
+"""Local pytest hooks and fixtures for the cyexiv2 testsuite."""
 
 import pytest
 
+from pyexiv2.metadata import ImageMetadata
+from .helpers import EMPTY_JPG_DATA
+
+
+@pytest.fixture(scope='session')
+def empty_jpg_template(tmp_path_factory):
+    """The pathname of a file containing EMPTY_JPG_DATA, written once per
+       test run.  Tests must not modify it; fixtures that need a
+       writable empty image should copy it.
+    """
+    path = tmp_path_factory.mktemp("template") / "empty.jpg"
+    path.write_bytes(EMPTY_JPG_DATA)
+    path.chmod(0o0400)  # r--------
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def _parsed_empty_meta():
+    """Two ImageMetadata objects read from EMPTY_JPG_DATA, parsed once
+       per test run: a pristine template, and the instance handed out
+       by ``empty_meta``.
+    """
+    template = ImageMetadata.from_buffer(EMPTY_JPG_DATA)
+    template.read()
+    shared = ImageMetadata.from_buffer(EMPTY_JPG_DATA)
+    shared.read()
+    return template, shared
+
+
+@pytest.fixture
+def empty_meta(_parsed_empty_meta):
+    """An ImageMetadata with no tags and no comment, which the test may
+       modify freely.  ImageMetadata cannot be deep-copied, so instead
+       the same object is reused, and after each test the template's
+       metadata is copied back over whatever the test changed.
+    """
+    template, shared = _parsed_empty_meta
+    yield shared
+    template.copy(shared)
+
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -26,12 +26,15 @@
 # ******************************************************************************
 
 from collections import namedtuple
+from contextlib import contextmanager
 import datetime
+import functools
 import hashlib
 import os.path
 
 from pyexiv2.metadata import ImageMetadata
-from pyexiv2.utils import FixedOffset, make_fraction
+from pyexiv2.utils import _fixed_offset, make_fraction
+from pyexiv2.xmp import register_namespace, unregister_namespace
 
 #: A 1x1 JPG image with no tags.
 EMPTY_JPG_DATA = (
@@ -92,18 +95,15 @@ def get_absolute_file_path(*filepath):
     return os.path.join(os.path.dirname(os.path.abspath(__file__)), *filepath)
 
 
-def md5sum_file(filename):
-    """
-    Compute the MD5 hash of the file FILENAME.
-    """
-    with open(filename, 'rb') as f:
-        return hashlib.md5(f.read()).hexdigest()
-
-
 FileInfo = namedtuple('FileInfo', ('filepath', 'filedata', 'md5sum'))
 
 
+@functools.lru_cache(maxsize=None)
 def load_data_file(name, md5sum):
+    """Read the data file NAME, check its MD5 hash against MD5SUM, and
+       return a FileInfo for it.  Each file is only read and hashed once
+       per test run; since FileInfo is immutable, it is safe to share.
+    """
     filepath = get_absolute_file_path("data", name)
     with open(filepath, 'rb') as fp:
         filedata = fp.read()
@@ -112,6 +112,10 @@ def load_data_file(name, md5sum):
 
 
 def load_image(name, md5sum):
+    """Return a freshly read ImageMetadata for the data file NAME.
+       Unlike the file contents, this is not cached, because callers
+       are free to modify it.
+    """
     fi = load_data_file(name, md5sum)
     m = ImageMetadata.from_buffer(fi.filedata)
     m.read()
@@ -119,7 +123,8 @@ def load_image(name, md5sum):
 
 
 class LazyTagCreator(dict):
-    """Cache for {Exif,Iptc,Xmp}Tag objects.
+    """Cache for {Exif,Iptc,Xmp}Tag objects.  Each tag is created from
+       its template on first lookup, then served from the dict.
     """
     def __init__(self, tagcons, tmpl):
         dict.__init__(self)
@@ -135,10 +140,26 @@ class LazyTagCreator(dict):
             tagkey = tmpl
             tagtype = key
         tag = self._tagcons(tagkey)
+        # Only cache a tag of the expected type, so that a mismatch
+        # fails every lookup rather than just the first.
         assert tag.type == tagtype
+        self[key] = tag
         return tag
 
 
+@contextmanager
+def registered_ns(name, prefix):
+    """Context manager which registers the custom XMP namespace NAME
+       under PREFIX for the duration of the block, and unregisters it
+       afterward even if the block fails.
+    """
+    register_namespace(name, prefix)
+    try:
+        yield
+    finally:
+        unregister_namespace(name)
+
+
 def expand_conversions(conversions):
     """Expand a table of conversions as used to parametrize
        e.g. test_exif.py::test_conversion."""
@@ -158,7 +179,7 @@ def T(h=0, mi=0, s=0, us=0, tz=()):
     if tz is None:
         return datetime.time(h, mi, s, us)
     else:
-        return datetime.time(h, mi, s, us, tzinfo=FixedOffset(*tz))
+        return datetime.time(h, mi, s, us, tzinfo=_fixed_offset(*tz))
 
 
 def DT(y, mo, d, h=0, mi=0, s=0, us=0, tz=()):
@@ -166,5 +187,5 @@ def DT(y, mo, d, h=0, mi=0, s=0, us=0, tz=()):
         return datetime.datetime(y, mo, d, h, mi, s, us)
     else:
         return datetime.datetime(
-            y, mo, d, h, mi, s, us, tzinfo=FixedOffset(*tz)
+            y, mo, d, h, mi, s, us, tzinfo=_fixed_offset(*tz)
         )
@@ -51,11 +51,17 @@ assert stat.S_IEXEC == 0o0100
 
 
 @pytest.fixture(scope='module')
-def scratch_directory():
-    """A user-writable scratch directory which will be deleted after
-       tests complete.  Used by the fixtures below.
+def scratch_directory(tmp_path_factory):
+    """A user-writable scratch directory, private to this module and
+       to the current test worker, which will be deleted after the
+       module's tests complete.  Used by the fixtures below.
+       It is created under pytest's base temporary directory, which is
+       separate for each pytest-xdist worker, so that parallel runs
+       cannot collide; pytest keeps its last few base directories, so
+       the scratch directory itself is deleted explicitly.
     """
-    with tempfile.TemporaryDirectory(prefix="cyexiv2-test-") as tdir:
+    base = str(tmp_path_factory.mktemp("cyexiv2-"))
+    with tempfile.TemporaryDirectory(prefix="cyexiv2-test-", dir=base) as tdir:
         os.chmod(tdir, 0o0700)  # rwx------
         yield tdir
 
@@ -71,21 +77,36 @@ def empty_directory(scratch_directory):
     return emptydir
 
 
+_path_counter = itertools.count()
+
+
+def _write_empty_jpg(scratch_directory):
+    """Create a new file in SCRATCH_DIRECTORY containing EMPTY_JPG_DATA,
+       and return its pathname.  The file descriptor is closed before
+       returning, to avoid tripping over Windows' exclusive file access
+       rules.  Cleanup is handled by the teardown of the
+       scratch_directory fixture.
+    """
+    name = os.path.join(
+        scratch_directory, 'jpg_%d.jpg' % next(_path_counter)
+    )
+    # O_BINARY exists, and is needed, only on Windows.
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    fd = os.open(name, flags, 0o0600)
+    try:
+        os.write(fd, EMPTY_JPG_DATA)
+    finally:
+        os.close(fd)
+    return name
+
+
 @pytest.fixture(scope='module')
 def jpg_with_tags(scratch_directory):
     """A JPEG file with several tags, used by a bunch of tests.
        This fixture creates the file itself and returns its pathname.
        The file is made read-only for safety.
-       N.B. we use NamedTemporaryFile(delete=False) because we want to be
-       able to close the initial file descriptor, to avoid tripping
-       over Windows' exclusive file access rules.  Cleanup is handled
-       by the teardown of the scratch_directory fixture.
     """
-    with tempfile.NamedTemporaryFile(
-        dir=scratch_directory, suffix='.jpg', delete=False
-    ) as fp:
-        fp.write(EMPTY_JPG_DATA)
-        name = fp.name
+    name = _write_empty_jpg(scratch_directory)
 
     # Write some metadata
     m = ImageMetadata(name)
@@ -133,6 +154,60 @@ def metadata_rw(jpg_with_tags, scratch_directory):
     return MetadataWithPath(nname, ImageMetadata(nname))
 
 
+@pytest.fixture(scope='module')
+def jpg_with_tags_bytes(jpg_with_tags):
+    """The contents of the jpg_with_tags file."""
+    with open(jpg_with_tags, 'rb') as fp:
+        return fp.read()
+
+
+@pytest.fixture(scope='module')
+def cached_read_metadata(jpg_with_tags_bytes):
+    """An ImageMetadata object for the jpg_with_tags, created from a
+       buffer, on which read() has already been called.  It is shared
+       by all the tests in this module, so tests using it must not
+       modify it.
+    """
+    m = ImageMetadata.from_buffer(jpg_with_tags_bytes)
+    m.read()
+    return m
+
+
+@pytest.fixture(scope='function')
+def fresh_read_metadata(jpg_with_tags_bytes):
+    """Like cached_read_metadata, but a fresh object for each test,
+       which the test may modify freely.
+    """
+    m = ImageMetadata.from_buffer(jpg_with_tags_bytes)
+    m.read()
+    return m
+
+
+def _raw_exif(m, key):
+    """The raw value of the EXIF tag KEY, as seen by libexiv2."""
+    return m._image._getExifTag(key)._getRawValue().decode('ascii')
+
+
+def _raw_iptc(m, key):
+    """The raw values of the IPTC tag KEY, as seen by libexiv2."""
+    return m._image._getIptcTag(key)._getRawValues()
+
+
+def _xmp_text(m, key):
+    """The text value of the XMP tag KEY, as seen by libexiv2."""
+    return m._image._getXmpTag(key)._getTextValue()
+
+
+def _xmp_array(m, key):
+    """The array value of the XMP tag KEY, as seen by libexiv2."""
+    return m._image._getXmpTag(key)._getArrayValue()
+
+
+def _xmp_langalt(m, key):
+    """The lang-alt value of the XMP tag KEY, as seen by libexiv2."""
+    return m._image._getXmpTag(key)._getLangAltValue()
+
+
 ######################
 # Test general methods
 ######################
@@ -189,11 +264,7 @@ def test_not_read_raises(metadata_ro, scratch_directory, suite):
         locals['nonexistent_jpg'] = pathname
 
     if 'empty_jpg' in suite:
-        with tempfile.NamedTemporaryFile(
-            dir=scratch_directory, suffix='.jpg', delete=False
-        ) as fp:
-            fp.write(EMPTY_JPG_DATA)
-            locals['empty_jpg'] = fp.name
+        locals['empty_jpg'] = _write_empty_jpg(scratch_directory)
 
     with pytest.raises(OSError):
         exec(suite, {}, locals)
@@ -214,50 +285,36 @@ def test_read_nonexistent_file(empty_directory):
         m.read()
 
 
-def test_write_preserve_timestamps(metadata_rw):
+@pytest.mark.parametrize("preserve, expect_mtime_change", [
+    (True, False),
+    (False, True),
+])
+def test_write_timestamps(metadata_rw, preserve, expect_mtime_change):
     path = metadata_rw.pathname
     m = metadata_rw.metadata
-    st = os.stat(path)
-
-    m.read()
-    m.comment = 'Yellow Submarine'
-    time.sleep(1.1)
-    m.write(preserve_timestamps=True)
-    st2 = os.stat(path)
 
-    # It may not have been possible to preserve the _exact_ timestamp.
-    # Round to the nearest second before comparison.
-    assert round(st.st_atime) == round(st2.st_atime)
-    assert round(st.st_mtime) == round(st2.st_mtime)
-
-
-def test_write_dont_preserve_timestamps(metadata_rw):
-    path = metadata_rw.pathname
-    m = metadata_rw.metadata
+    # Backdate the file, rather than sleeping, so that a write which
+    # does not preserve the timestamps is guaranteed to change them.
+    then = time.time() - 5
+    os.utime(path, (then, then))
     st = os.stat(path)
 
     m.read()
     m.comment = 'Yellow Submarine'
-    time.sleep(1.1)
-    m.write(preserve_timestamps=False)
+    m.write(preserve_timestamps=preserve)
     st2 = os.stat(path)
 
-    # m.write should have modified the mtime, and may or may not
-    # have modified the atime, depending on mount options
-    # (e.g. noatime, relatime).  See discussion at
-    # <http://bugs.launchpad.net/pyexiv2/+bug/624999>.
-    assert st.st_mtime != st2.st_mtime
-
-    m.comment = 'Yesterday'
-    time.sleep(1.1)
-    m.write(preserve_timestamps=True)
-
-    # metadata.write(preserve_timestamps=True) should not have
-    # modified either the mtime or the atime, relative to what
-    # they were at point 2.
-    st3 = os.stat(path)
-    assert round(st3.st_mtime) == round(st2.st_mtime)
-    assert round(st3.st_atime) == round(st2.st_atime)
+    if expect_mtime_change:
+        # m.write should have modified the mtime, and may or may not
+        # have modified the atime, depending on mount options
+        # (e.g. noatime, relatime).  See discussion at
+        # <http://bugs.launchpad.net/pyexiv2/+bug/624999>.
+        assert st.st_mtime != st2.st_mtime
+    else:
+        # It may not have been possible to preserve the _exact_
+        # timestamp.  Round to the nearest second before comparison.
+        assert round(st.st_atime) == round(st2.st_atime)
+        assert round(st.st_mtime) == round(st2.st_mtime)
 
 
 ###########################
@@ -274,9 +331,8 @@ def test_exif_keys(metadata_ro):
     assert m._keys['exif'] == keys
 
 
-def test_get_exif_tag(metadata_ro):
-    m = metadata_ro.metadata
-    m.read()
+def test_get_exif_tag(fresh_read_metadata):
+    m = fresh_read_metadata
     assert m._tags['exif'] == {}
     # Get an existing tag
     key = 'Exif.Image.Make'
@@ -311,10 +367,7 @@ def test_set_exif_tag_create(metadata_ro):
     assert tag.key in m.exif_keys
     assert m._tags['exif'] == {tag.key: tag}
     assert tag.key in m._image._exifKeys()
-    assert (
-        m._image._getExifTag(tag.key)._getRawValue().decode('ascii')
-        == tag.raw_value
-    )
+    assert _raw_exif(m, tag.key) == tag.raw_value
 
 
 def test_set_exif_tag_overwrite(metadata_ro):
@@ -328,10 +381,7 @@ def test_set_exif_tag_overwrite(metadata_ro):
     m._set_exif_tag(tag.key, tag)
     assert m._tags['exif'] == {tag.key: tag}
     assert tag.key in m._image._exifKeys()
-    assert (
-        m._image._getExifTag(tag.key)._getRawValue().decode('ascii')
-        == tag.raw_value
-    )
+    assert _raw_exif(m, tag.key) == tag.raw_value
 
 
 def test_set_exif_tag_overwrite_already_cached(metadata_ro):
@@ -346,10 +396,7 @@ def test_set_exif_tag_overwrite_already_cached(metadata_ro):
     m._set_exif_tag(key, new_tag)
     assert m._tags['exif'] == {key: new_tag}
     assert key in m._image._exifKeys()
-    assert (
-        m._image._getExifTag(key)._getRawValue().decode('ascii')
-        == new_tag.raw_value
-    )
+    assert _raw_exif(m, key) == new_tag.raw_value
 
 
 def test_set_exif_tag_direct_value_assignment(metadata_ro):
@@ -365,15 +412,11 @@ def test_set_exif_tag_direct_value_assignment(metadata_ro):
     tag = m._get_exif_tag(key)
     assert tag.value == value
     assert m._tags['exif'] == {key: tag}
-    assert (
-        m._image._getExifTag(key)._getRawValue().decode('ascii')
-        == tag.raw_value
-    )
+    assert _raw_exif(m, key) == tag.raw_value
 
 
-def test_delete_exif_tag_inexistent(metadata_ro):
-    m = metadata_ro.metadata
-    m.read()
+def test_delete_exif_tag_inexistent(cached_read_metadata):
+    m = cached_read_metadata
     key = 'Exif.Image.Artist'
     with pytest.raises(KeyError):
         m._delete_exif_tag(key)
@@ -416,9 +459,8 @@ def test_iptc_keys(metadata_ro):
     assert m._keys['iptc'] == keys
 
 
-def test_get_iptc_tag(metadata_ro):
-    m = metadata_ro.metadata
-    m.read()
+def test_get_iptc_tag(fresh_read_metadata):
+    m = fresh_read_metadata
     assert m._tags['iptc'] == {}
     # Get an existing tag
     key = 'Iptc.Application2.DateCreated'
@@ -453,7 +495,7 @@ def test_set_iptc_tag_create(metadata_ro):
     assert tag.key in m.iptc_keys
     assert m._tags['iptc'] == {tag.key: tag}
     assert tag.key in m._image._iptcKeys()
-    assert m._image._getIptcTag(tag.key)._getRawValues() == [b'Nobody']
+    assert _raw_iptc(m, tag.key) == [b'Nobody']
 
 
 def test_set_iptc_tag_overwrite(metadata_ro):
@@ -465,7 +507,7 @@ def test_set_iptc_tag_overwrite(metadata_ro):
     m._set_iptc_tag(tag.key, tag)
     assert m._tags['iptc'] == {tag.key: tag}
     assert tag.key in m._image._iptcKeys()
-    assert m._image._getIptcTag(tag.key)._getRawValues() == [b'A picture.']
+    assert _raw_iptc(m, tag.key) == [b'A picture.']
 
 
 def test_set_iptc_tag_overwrite_already_cached(metadata_ro):
@@ -480,7 +522,7 @@ def test_set_iptc_tag_overwrite_already_cached(metadata_ro):
     m._set_iptc_tag(key, new_tag)
     assert m._tags['iptc'] == {key: new_tag}
     assert key in m._image._iptcKeys()
-    assert m._image._getIptcTag(key)._getRawValues() == [b'A picture.']
+    assert _raw_iptc(m, key) == [b'A picture.']
 
 
 def test_set_iptc_tag_direct_value_assignment(metadata_ro):
@@ -496,12 +538,11 @@ def test_set_iptc_tag_direct_value_assignment(metadata_ro):
     tag = m._get_iptc_tag(key)
     assert tag.value == values
     assert m._tags['iptc'] == {key: tag}
-    assert m._image._getIptcTag(key)._getRawValues() == [b'Nobody']
+    assert _raw_iptc(m, key) == [b'Nobody']
 
 
-def test_delete_iptc_tag_inexistent(metadata_ro):
-    m = metadata_ro.metadata
-    m.read()
+def test_delete_iptc_tag_inexistent(cached_read_metadata):
+    m = cached_read_metadata
     key = 'Iptc.Application2.LocationCode'
     with pytest.raises(KeyError):
         m._delete_iptc_tag(key)
@@ -544,9 +585,8 @@ def test_xmp_keys(metadata_ro):
     assert m._keys['xmp'] == keys
 
 
-def test_get_xmp_tag(metadata_ro):
-    m = metadata_ro.metadata
-    m.read()
+def test_get_xmp_tag(fresh_read_metadata):
+    m = fresh_read_metadata
     assert m._tags['xmp'] == {}
     # Get an existing tag
     key = 'Xmp.dc.subject'
@@ -586,7 +626,7 @@ def test_set_xmp_tag_create(metadata_ro):
     assert tag.key in m.xmp_keys
     assert m._tags['xmp'] == {tag.key: tag}
     assert tag.key in m._image._xmpKeys()
-    assert m._image._getXmpTag(tag.key)._getLangAltValue() == {
+    assert _xmp_langalt(m, tag.key) == {
         'x-default': 'This is not a title',
         'fr-FR': "Ceci n'est pas un titre"
     }
@@ -601,7 +641,7 @@ def test_set_xmp_tag_overwrite(metadata_ro):
     m._set_xmp_tag(tag.key, tag)
     assert m._tags['xmp'] == {tag.key: tag}
     assert tag.key in m._image._xmpKeys()
-    assert m._image._getXmpTag(tag.key)._getTextValue() == tag.raw_value
+    assert _xmp_text(m, tag.key) == tag.raw_value
 
 
 def test_set_xmp_tag_overwrite_already_cached(metadata_ro):
@@ -616,7 +656,7 @@ def test_set_xmp_tag_overwrite_already_cached(metadata_ro):
     m._set_xmp_tag(key, new_tag)
     assert m._tags['xmp'] == {key: new_tag}
     assert key in m._image._xmpKeys()
-    assert m._image._getXmpTag(key)._getArrayValue() == ['hello', 'world']
+    assert _xmp_array(m, key) == ['hello', 'world']
 
 
 def test_set_xmp_tag_direct_value_assignment(metadata_ro):
@@ -632,15 +672,14 @@ def test_set_xmp_tag_direct_value_assignment(metadata_ro):
     tag = m._get_xmp_tag(key)
     assert tag.value == value
     assert m._tags['xmp'] == {key: tag}
-    assert m._image._getXmpTag(key)._getLangAltValue() == {
+    assert _xmp_langalt(m, key) == {
         'x-default': 'Landscape',
         'fr-FR': "Paysage"
     }
 
 
-def test_delete_xmp_tag_inexistent(metadata_ro):
-    m = metadata_ro.metadata
-    m.read()
+def test_delete_xmp_tag_inexistent(cached_read_metadata):
+    m = cached_read_metadata
     key = 'Xmp.xmp.CreatorTool'
     with pytest.raises(KeyError):
         m._delete_xmp_tag(key)
@@ -673,10 +712,15 @@ def test_delete_xmp_tag_cached(metadata_ro):
 # Test dictionary interface
 ###########################
 
+#: Keys of tags which are not present in the jpg_with_tags.
+NONEXISTENT_KEYS = (
+    'Exif.Image.SamplesPerPixel', 'Iptc.Application2.FixtureId',
+    'Xmp.xmp.Rating', 'Wrong.Noluck.Raise'
+)
 
-def test_getitem(metadata_ro):
-    m = metadata_ro.metadata
-    m.read()
+
+def test_getitem(cached_read_metadata):
+    m = cached_read_metadata
     # Get existing tags
     key = 'Exif.Image.DateTime'
     tag = m[key]
@@ -687,14 +731,41 @@ def test_getitem(metadata_ro):
     key = 'Xmp.dc.format'
     tag = m[key]
     assert isinstance(tag, XmpTag)
-    # Try to get nonexistent tags
-    keys = (
-        'Exif.Image.SamplesPerPixel', 'Iptc.Application2.FixtureId',
-        'Xmp.xmp.Rating', 'Wrong.Noluck.Raise'
-    )
+
+
+@pytest.mark.parametrize("key", NONEXISTENT_KEYS)
+def test_getitem_nonexistent(cached_read_metadata, key):
+    with pytest.raises(KeyError):
+        cached_read_metadata[key]
+
+
+def test_xmp_count(fresh_read_metadata):
+    m = fresh_read_metadata
+    # Before and after the list of keys has been built
+    assert m._keys['xmp'] is None
+    count = m.xmp_count()
+    assert count == len(m.xmp_keys)
+    assert m.xmp_count() == count
+    m['Xmp.dc.source'] = 'FreeFoto.com'
+    assert m.xmp_count() == count + 1
+    del m['Xmp.dc.source']
+    assert m.xmp_count() == count
+
+
+def test_get_tags(cached_read_metadata):
+    m = cached_read_metadata
+    keys = ['Exif.Image.DateTime', 'Iptc.Application2.Caption',
+            'Xmp.dc.format']
+    tags = m.get_tags(keys)
+    assert set(tags) == set(keys)
     for key in keys:
-        with pytest.raises(KeyError):
-            m[key]
+        assert tags[key] is m[key]
+
+
+@pytest.mark.parametrize("key", NONEXISTENT_KEYS)
+def test_get_tags_nonexistent(cached_read_metadata, key):
+    with pytest.raises(KeyError):
+        cached_read_metadata.get_tags(['Exif.Image.DateTime', key])
 
 
 def test_setitem(metadata_ro):
@@ -750,14 +821,12 @@ def test_delitem(metadata_ro):
     del m[key]
     assert key not in m._keys['xmp']
     assert key not in m._tags['xmp']
-    # Try to delete nonexistent tags
-    keys = (
-        'Exif.Image.SamplesPerPixel', 'Iptc.Application2.FixtureId',
-        'Xmp.xmp.Rating', 'Wrong.Noluck.Raise'
-    )
-    for key in keys:
-        with pytest.raises(KeyError):
-            del m[key]
+
+
+@pytest.mark.parametrize("key", NONEXISTENT_KEYS)
+def test_delitem_nonexistent(cached_read_metadata, key):
+    with pytest.raises(KeyError):
+        del cached_read_metadata[key]
 
 
 def test_replace_tag_by_itself(metadata_ro):
@@ -787,9 +856,8 @@ def test_nonexistent_tag_family(metadata_ro):
 ##########################
 
 
-def test_get_comment(metadata_ro):
-    m = metadata_ro.metadata
-    m.read()
+def test_get_comment(cached_read_metadata):
+    m = cached_read_metadata
     assert m.comment == 'Hello World!'
 
 
@@ -815,11 +883,10 @@ def test_delete_comment(metadata_ro):
 ####################
 
 
-def test_copy_metadata(metadata_ro):
+def test_copy_metadata(metadata_ro, empty_meta):
     m = metadata_ro.metadata
     m.read()
-    other = ImageMetadata.from_buffer(EMPTY_JPG_DATA)
-    other.read()
+    other = empty_meta
     families = ('exif', 'iptc', 'xmp')
 
     for family in families:
@@ -851,9 +918,8 @@ def test_copy_metadata(metadata_ro):
 #############################
 
 
-def test_mutablemapping():
-    clean = ImageMetadata.from_buffer(EMPTY_JPG_DATA)
-    clean.read()
+def test_mutablemapping(empty_meta):
+    clean = empty_meta
 
     assert len(clean) == 0
     assert 'Exif.Image.DateTimeOriginal' not in clean
@@ -897,137 +963,133 @@ def test_mutablemapping():
 ###########################
 
 
-def _test_thumbnail_tags(m, present):
-    keys = (
-        'Exif.Thumbnail.Compression',
-        'Exif.Thumbnail.JPEGInterchangeFormat',
-        'Exif.Thumbnail.JPEGInterchangeFormatLength',
-    )
-    for key in keys:
-        assert (key in m.exif_keys) == present
-
-
-def test_no_exif_thumbnail(metadata_ro):
-    m = metadata_ro.metadata
-    m.read()
-    thumb = m.exif_thumbnail
-    assert thumb.mime_type == ''
-    assert thumb.extension == ''
-    # ExifThumbnail._get_data not yet implemented
-    # assert thumb.data == ''
-    _test_thumbnail_tags(m, False)
-
-
-def test_set_exif_thumbnail_from_data(metadata_ro):
-    m = metadata_ro.metadata
-    m.read()
-    _test_thumbnail_tags(m, False)
-    thumb = m.exif_thumbnail
-    thumb.data = EMPTY_JPG_DATA
-    assert thumb.mime_type == 'image/jpeg'
-    assert thumb.extension == '.jpg'
-    # ExifThumbnail._get_data not yet implemented
-    # assert thumb.data == EMPTY_JPG_DATA
-    _test_thumbnail_tags(m, True)
-
-
-def test_set_exif_thumbnail_from_file(metadata_ro, scratch_directory):
-    m = metadata_ro.metadata
-    m.read()
-    thumb = m.exif_thumbnail
-    _test_thumbnail_tags(m, False)
-
-    with tempfile.NamedTemporaryFile(
-        dir=scratch_directory, suffix='.jpg'
-    ) as fp:
-        fp.write(EMPTY_JPG_DATA)
-        fp.flush()
-        thumb.set_from_file(fp.name)
-
-    assert thumb.mime_type == 'image/jpeg'
-    assert thumb.extension == '.jpg'
-    # ExifThumbnail._get_data not yet implemented
-    # assert thumb.data == EMPTY_JPG_DATA
-    _test_thumbnail_tags(m, True)
-
-
-def test_write_exif_thumbnail_to_file(metadata_ro, scratch_directory):
-    m = metadata_ro.metadata
-    m.read()
-    _test_thumbnail_tags(m, False)
-    thumb = m.exif_thumbnail
-    thumb.data = EMPTY_JPG_DATA
-
-    # tempfile.mktemp would actually be safe here because we are the
-    # only process that can write to the scratch_directory, but then
-    # we'd have to suppress warnings.  This can be cleaned up if and
-    # when thumb.write_to_file grows the ability to write to a filelike.
-    fd, pathname = tempfile.mkstemp(dir=scratch_directory)
-    os.close(fd)
-
-    # This actually writes to pathname + thumb.extension.
-    thumb.write_to_file(pathname)
-    with open(pathname + thumb.extension, 'rb') as fp:
-        assert fp.read() == EMPTY_JPG_DATA
-
-
-def test_erase_exif_thumbnail(metadata_ro):
-    m = metadata_ro.metadata
-    m.read()
-    _test_thumbnail_tags(m, False)
-    thumb = m.exif_thumbnail
-    thumb.data = EMPTY_JPG_DATA
-    assert thumb.mime_type == 'image/jpeg'
-    assert thumb.extension == '.jpg'
-    # ExifThumbnail._get_data not yet implemented
-    # assert thumb.data == EMPTY_JPG_DATA
-    _test_thumbnail_tags(m, True)
-    thumb.erase()
-    assert thumb.mime_type == ''
-    assert thumb.extension == ''
-    # assert thumb.data == ''
-    _test_thumbnail_tags(m, False)
-
-
-def test_set_exif_thumbnail_from_invalid_data(metadata_ro):
-    m = metadata_ro.metadata
-    m.read()
-    _test_thumbnail_tags(m, False)
-    thumb = m.exif_thumbnail
+_THUMB_KEYS = (
+    'Exif.Thumbnail.Compression',
+    'Exif.Thumbnail.JPEGInterchangeFormat',
+    'Exif.Thumbnail.JPEGInterchangeFormatLength',
+)
 
-    # No check on the format of the buffer is performed, so this will
-    # succeed.
-    thumb.data = b'invalid'
-    assert thumb.mime_type == 'image/jpeg'
-    _test_thumbnail_tags(m, True)
 
+def _test_thumbnail_tags(m, present):
+    for key in _THUMB_KEYS:
+        assert (key in m.exif_keys) == present
 
-def test_set_exif_thumbnail_from_nonexistent_file(
-    metadata_ro, empty_directory
-):
-    m = metadata_ro.metadata
-    m.read()
-    _test_thumbnail_tags(m, False)
 
-    non_jpg = os.path.join(empty_directory, 'non.jpg')
-    with pytest.raises(OSError):
-        m.exif_thumbnail.set_from_file(non_jpg)
+class TestExifThumbnail:
+    """All of these tests start from the jpg_with_tags metadata, read,
+       with no thumbnail present.  Any thumbnail a test sets is erased
+       again on teardown, so that the state does not leak into other
+       tests even if metadata_ro is shared between them.
+    """
 
-    _test_thumbnail_tags(m, False)
+    @pytest.fixture(autouse=True)
+    def _setup(self, metadata_ro):
+        m = metadata_ro.metadata
+        m.read()
+        assert not any(key in m.exif_keys for key in _THUMB_KEYS)
+        yield
+        m.exif_thumbnail.erase()
+
+    def test_no_exif_thumbnail(self, metadata_ro):
+        thumb = metadata_ro.metadata.exif_thumbnail
+        assert thumb.mime_type == ''
+        assert thumb.extension == ''
+        # ExifThumbnail._get_data not yet implemented
+        # assert thumb.data == ''
+
+    def test_set_exif_thumbnail_from_data(self, metadata_ro):
+        m = metadata_ro.metadata
+        thumb = m.exif_thumbnail
+        thumb.data = EMPTY_JPG_DATA
+        assert thumb.mime_type == 'image/jpeg'
+        assert thumb.extension == '.jpg'
+        # ExifThumbnail._get_data not yet implemented
+        # assert thumb.data == EMPTY_JPG_DATA
+        _test_thumbnail_tags(m, True)
+
+    def test_set_exif_thumbnail_from_file(
+        self, metadata_ro, scratch_directory
+    ):
+        m = metadata_ro.metadata
+        thumb = m.exif_thumbnail
 
+        with tempfile.NamedTemporaryFile(
+            dir=scratch_directory, suffix='.jpg'
+        ) as fp:
+            fp.write(EMPTY_JPG_DATA)
+            fp.flush()
+            thumb.set_from_file(fp.name)
+
+        assert thumb.mime_type == 'image/jpeg'
+        assert thumb.extension == '.jpg'
+        # ExifThumbnail._get_data not yet implemented
+        # assert thumb.data == EMPTY_JPG_DATA
+        _test_thumbnail_tags(m, True)
+
+    def test_write_exif_thumbnail_to_file(
+        self, metadata_ro, scratch_directory
+    ):
+        thumb = metadata_ro.metadata.exif_thumbnail
+        thumb.data = EMPTY_JPG_DATA
+
+        # tempfile.mktemp would actually be safe here because we are the
+        # only process that can write to the scratch_directory, but then
+        # we'd have to suppress warnings.  This can be cleaned up if and
+        # when thumb.write_to_file grows the ability to write to a
+        # filelike.
+        fd, pathname = tempfile.mkstemp(dir=scratch_directory)
+        os.close(fd)
 
-def test_exif_thumbnail_is_preview(metadata_ro):
-    m = metadata_ro.metadata
-    m.read()
-    _test_thumbnail_tags(m, False)
-    assert len(m.previews) == 0
-    thumb = m.exif_thumbnail
-    thumb.data = EMPTY_JPG_DATA
-    _test_thumbnail_tags(m, True)
-    assert len(m.previews) == 1
-    preview = m.previews[0]
-    assert thumb.mime_type == preview.mime_type
-    assert thumb.extension == preview.extension
+        # This actually writes to pathname + thumb.extension.
+        thumb.write_to_file(pathname)
+        with open(pathname + thumb.extension, 'rb') as fp:
+            assert fp.read() == EMPTY_JPG_DATA
+
+    def test_erase_exif_thumbnail(self, metadata_ro):
+        m = metadata_ro.metadata
+        thumb = m.exif_thumbnail
+        thumb.data = EMPTY_JPG_DATA
+        assert thumb.mime_type == 'image/jpeg'
+        assert thumb.extension == '.jpg'
+        # ExifThumbnail._get_data not yet implemented
+        # assert thumb.data == EMPTY_JPG_DATA
+        _test_thumbnail_tags(m, True)
+        thumb.erase()
+        assert thumb.mime_type == ''
+        assert thumb.extension == ''
+        # assert thumb.data == ''
+        _test_thumbnail_tags(m, False)
+
+    def test_set_exif_thumbnail_from_invalid_data(self, metadata_ro):
+        m = metadata_ro.metadata
+        thumb = m.exif_thumbnail
+
+        # No check on the format of the buffer is performed, so this will
+        # succeed.
+        thumb.data = b'invalid'
+        assert thumb.mime_type == 'image/jpeg'
+        _test_thumbnail_tags(m, True)
+
+    def test_set_exif_thumbnail_from_nonexistent_file(
+        self, metadata_ro, empty_directory
+    ):
+        m = metadata_ro.metadata
+        non_jpg = os.path.join(empty_directory, 'non.jpg')
+        with pytest.raises(OSError):
+            m.exif_thumbnail.set_from_file(non_jpg)
+
+        _test_thumbnail_tags(m, False)
+
+    def test_exif_thumbnail_is_preview(self, metadata_ro):
+        m = metadata_ro.metadata
+        assert len(m.previews) == 0
+        thumb = m.exif_thumbnail
+        thumb.data = EMPTY_JPG_DATA
+        _test_thumbnail_tags(m, True)
+        assert len(m.previews) == 1
+        preview = m.previews[0]
+        assert thumb.mime_type == preview.mime_type
+        assert thumb.extension == preview.extension
 
 
 #########################
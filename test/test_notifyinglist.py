@@ -25,12 +25,18 @@
 #
 # ******************************************************************************
 
+import copy
+import operator
+import pickle
+
 import pytest
 
 from pyexiv2.utils import ListenerInterface, NotifyingList
 
 
 class SimpleListener(ListenerInterface):
+    __slots__ = ('changes',)
+
     def __init__(self):
         self.changes = 0
 
@@ -91,65 +97,54 @@ def test_no_listener(values):
     ]
 
 
+def _raises_notimpl(fn, *args, **kwargs):
+    with pytest.raises(NotImplementedError):
+        fn(*args, **kwargs)
+
+
 def test_listener_interface(values):
     # None of the listener methods are implemented, so they will all
     # throw, but this happens _after_ the modification, which still
     # sticks.
     values.register_listener(ListenerInterface())
 
-    with pytest.raises(NotImplementedError):
-        values[3] = 13
+    _raises_notimpl(operator.setitem, values, 3, 13)
     assert values == [5, 7, 9, 13, 57, 3, 2]
 
-    with pytest.raises(NotImplementedError):
-        del values[5]
+    _raises_notimpl(operator.delitem, values, 5)
     assert values == [5, 7, 9, 13, 57, 2]
 
-    with pytest.raises(NotImplementedError):
-        values.append(17)
+    _raises_notimpl(values.append, 17)
     assert values == [5, 7, 9, 13, 57, 2, 17]
 
-    with pytest.raises(NotImplementedError):
-        values.extend([11, 22])
+    _raises_notimpl(values.extend, [11, 22])
     assert values == [5, 7, 9, 13, 57, 2, 17, 11, 22]
 
-    with pytest.raises(NotImplementedError):
-        values.insert(4, 24)
+    _raises_notimpl(values.insert, 4, 24)
     assert values == [5, 7, 9, 13, 24, 57, 2, 17, 11, 22]
 
-    x = None
-    with pytest.raises(NotImplementedError):
-        x = values.pop()
-    # the assignment to x did not happen, but the list mutation did
-    assert x is None
+    _raises_notimpl(values.pop)
     assert values == [5, 7, 9, 13, 24, 57, 2, 17, 11]
 
-    with pytest.raises(NotImplementedError):
-        values.remove(9)
+    _raises_notimpl(values.remove, 9)
     assert values == [5, 7, 13, 24, 57, 2, 17, 11]
 
-    with pytest.raises(NotImplementedError):
-        values.reverse()
+    _raises_notimpl(values.reverse)
     assert values == [11, 17, 2, 57, 24, 13, 7, 5]
 
-    with pytest.raises(NotImplementedError):
-        values.sort()
+    _raises_notimpl(values.sort)
     assert values == [2, 5, 7, 11, 13, 17, 24, 57]
 
-    with pytest.raises(NotImplementedError):
-        values += [8, 4]
+    _raises_notimpl(operator.iadd, values, [8, 4])
     assert values == [2, 5, 7, 11, 13, 17, 24, 57, 8, 4]
 
-    with pytest.raises(NotImplementedError):
-        values[3:4] = [8, 4]
+    _raises_notimpl(operator.setitem, values, slice(3, 4), [8, 4])
     assert values == [2, 5, 7, 8, 4, 13, 17, 24, 57, 8, 4]
 
-    with pytest.raises(NotImplementedError):
-        del values[3:5]
+    _raises_notimpl(operator.delitem, values, slice(3, 5))
     assert values == [2, 5, 7, 13, 17, 24, 57, 8, 4]
 
-    with pytest.raises(NotImplementedError):
-        values *= 3
+    _raises_notimpl(operator.imul, values, 3)
     assert values == [
         2, 5, 7, 13, 17, 24, 57, 8, 4,
         2, 5, 7, 13, 17, 24, 57, 8, 4,
@@ -169,6 +164,31 @@ def check_listeners(listeners, expected_changes):
         assert l.changes == expected_changes
 
 
+def test_unregister_listener(values):
+    listeners = register_listeners(values, 2)
+    values.append(17)
+    check_listeners(listeners, 1)
+
+    values.unregister_listener(listeners[0])
+    values.append(18)
+    assert listeners[0].changes == 1
+    assert listeners[1].changes == 2
+
+    values.unregister_listener(listeners[1])
+    values.append(19)
+    assert listeners[0].changes == 1
+    assert listeners[1].changes == 2
+    assert values == [5, 7, 9, 14, 57, 3, 2, 17, 18, 19]
+
+    with pytest.raises(KeyError):
+        values.unregister_listener(listeners[1])
+
+    values.register_listener(listeners[1])
+    values.append(20)
+    assert listeners[0].changes == 1
+    assert listeners[1].changes == 3
+
+
 def test_setitem(values):
     listeners = register_listeners(values, 3)
     values[3] = 13
@@ -238,6 +258,10 @@ def test_pop(values):
     assert values == [5, 7, 9, 3]
     check_listeners(listeners, 3)
 
+    values.pop(None)
+    assert values == [5, 7, 9]
+    check_listeners(listeners, 4)
+
 
 def test_remove(values):
     listeners = register_listeners(values, 3)
@@ -272,6 +296,18 @@ def test_sort(values):
     assert values == [57, 14, 9, 7, 5, 3, 2]
     check_listeners(listeners, 3)
 
+    values.sort(abs, True)
+    assert values == [57, 14, 9, 7, 5, 3, 2]
+    check_listeners(listeners, 4)
+
+
+def test_same_signatures_without_listener(values):
+    # Whether a listener is registered must not change which arguments
+    # the methods accept.
+    assert values.pop(None) == 2
+    values.sort(abs, True)
+    assert values == [57, 14, 9, 7, 5, 3]
+
 
 def test_iadd(values):
     listeners = register_listeners(values, 3)
@@ -341,6 +377,15 @@ def test_setslice(values):
     assert values == [5, 7, 9, 14, 57, 3, 2]
     check_listeners(listeners, 11)
 
+    # Extended slicing, and assigning from an arbitrary iterable
+    values[::3] = [0, 1, 4]
+    assert values == [0, 7, 9, 1, 57, 3, 4]
+    check_listeners(listeners, 12)
+
+    values[1:3] = (x * 2 for x in (1, 2))
+    assert values == [0, 2, 4, 1, 57, 3, 4]
+    check_listeners(listeners, 13)
+
 
 def test_delslice(values):
     listeners = register_listeners(values, 3)
@@ -379,3 +424,47 @@ def test_delslice(values):
     del values[:]
     assert values == []
     check_listeners(listeners, 8)
+
+
+def test_delslice_extended(values):
+    listeners = register_listeners(values, 3)
+
+    del values[::3]
+    assert values == [7, 9, 57, 3]
+    check_listeners(listeners, 1)
+
+    del values[-1::-2]
+    assert values == [7, 57]
+    check_listeners(listeners, 2)
+
+
+@pytest.mark.parametrize("dup", [
+    copy.copy,
+    copy.deepcopy,
+    lambda values: pickle.loads(pickle.dumps(values)),
+], ids=['copy', 'deepcopy', 'pickle'])
+def test_copy(values, dup):
+    listeners = register_listeners(values, 2)
+    values.append(17)
+    check_listeners(listeners, 1)
+
+    other = dup(values)
+    assert type(other) is type(values)
+    assert other == values
+    other_listeners = other._listeners
+    # Rebuilding the copy notifies no one.
+    check_listeners(listeners, 1)
+    check_listeners(other_listeners, 1)
+
+    other.append(18)
+    check_listeners(other_listeners, 2)
+    assert values == [5, 7, 9, 14, 57, 3, 2, 17]
+
+    # A copy of a list without listeners has none either.
+    for listener in listeners:
+        values.unregister_listener(listener)
+    other = dup(values)
+    assert type(other) is type(values)
+    assert other == values
+    assert other._listeners == ()
+    other.append(18)
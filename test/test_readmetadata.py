@@ -30,6 +30,10 @@ import pytest
 from pyexiv2.utils import Fraction as FRt, GPSCoordinate as GPS
 from .helpers import load_image, FR, D, Dt, DT
 
+# Under pytest-xdist with --dist loadgroup, keep all of these tests on
+# the same worker, so that each test image is parsed only once.
+pytestmark = pytest.mark.xdist_group("readmetadata")
+
 
 def check_type_and_value(tag, etype, evalue):
     assert isinstance(tag.value, etype)
@@ -42,17 +46,7 @@ def check_type_and_values(tag, etype, evalues):
     assert tag.value == evalues
 
 
-@pytest.fixture(scope='module')
-def testImage1():
-    return load_image('DSCF_0273.JPG', 'af48f3889f68369e5e3ab75f42a21234')
-
-
-@pytest.fixture(scope='module')
-def testImage2():
-    return load_image('exiv2-bug540.jpg', '64d4b7eab1e78f1f6bfb3c966e99eef2')
-
-
-@pytest.mark.parametrize("key, ktype, value", [
+_EXIF_CASES = (
     ('Exif.Image.XResolution', FRt, FR(72, 1)),
     ('Exif.Image.YResolution', FRt, FR(72, 1)),
     ('Exif.Image.ResolutionUnit', int, 2),
@@ -63,23 +57,19 @@ def testImage2():
     ('Exif.Photo.FNumber', FRt, FR(8, 1)),
     ('Exif.Photo.PixelXDimension', int, 250),
     ('Exif.Photo.PixelYDimension', int, 140),
-])
-def test_read_metadata_exif(key, ktype, value, testImage1):
-    check_type_and_value(testImage1[key], ktype, value)
+)
 
 
-@pytest.mark.parametrize("key, ktype, values", [
+_IPTC_CASES = (
     ('Iptc.Application2.Caption', str, ['S']),
     ('Iptc.Application2.Byline', str, ['Vincent Vande Vyvre']),
     ('Iptc.Application2.0x00d7', str, ['www.oqapy.eu']),
     ('Iptc.Application2.Keywords', str, ['bruxelles botanique']),
     ('Iptc.Application2.Copyright', str, ['2013 Vincent Vande Vyvre']),
-])
-def test_read_metadata_iptc(key, ktype, values, testImage1):
-    check_type_and_values(testImage1[key], ktype, values)
+)
 
 
-@pytest.mark.parametrize("key, ktype, value", [
+_XMP_CASES = (
     ('Xmp.dc.creator', list, ['Ian Britton']),
     ('Xmp.dc.description', dict, {
         'x-default': 'Communications'
@@ -166,6 +156,43 @@ def test_read_metadata_iptc(key, ktype, values, testImage1):
     ),
     ('Xmp.xmpRights.Marked', bool, True),
     ('Xmp.xmpRights.WebStatement', str, 'www.freefoto.com'),
-])
-def test_read_metadata_xmp(key, ktype, value, testImage2):
-    check_type_and_value(testImage2[key], ktype, value)
+)
+
+
+@pytest.fixture(scope='module')
+def testImage1():
+    return load_image('DSCF_0273.JPG', 'af48f3889f68369e5e3ab75f42a21234')
+
+
+@pytest.fixture(scope='module')
+def testImage2():
+    return load_image('exiv2-bug540.jpg', '64d4b7eab1e78f1f6bfb3c966e99eef2')
+
+
+@pytest.fixture(scope='module')
+def xmpTags2(testImage2):
+    """All the XMP tags checked by test_read_metadata_xmp, fetched from
+       testImage2 with a single get_tags() call.  If any of them is
+       missing, this is empty, and each case looks its own key up, so
+       that only the cases for the missing tags fail.
+    """
+    try:
+        return testImage2.get_tags(case[0] for case in _XMP_CASES)
+    except KeyError:
+        return {}
+
+
+@pytest.mark.parametrize("key, ktype, value", _EXIF_CASES)
+def test_read_metadata_exif(key, ktype, value, testImage1):
+    check_type_and_value(testImage1[key], ktype, value)
+
+
+@pytest.mark.parametrize("key, ktype, values", _IPTC_CASES)
+def test_read_metadata_iptc(key, ktype, values, testImage1):
+    check_type_and_values(testImage1[key], ktype, values)
+
+
+@pytest.mark.parametrize("key, ktype, value", _XMP_CASES)
+def test_read_metadata_xmp(key, ktype, value, xmpTags2, testImage2):
+    tag = xmpTags2[key] if key in xmpTags2 else testImage2[key]
+    check_type_and_value(tag, ktype, value)
@@ -25,12 +25,12 @@
 #
 # ******************************************************************************
 
-import tempfile
+import shutil
 
 import pytest
 
 from pyexiv2.metadata import ImageMetadata
-from .helpers import load_image, EMPTY_JPG_DATA
+from .helpers import load_image
 
 
 @pytest.fixture(scope='module')
@@ -129,13 +129,15 @@ def test_write_unicode_mm(uc_unicode_mm):
     assert tag.value == 'παράδειγμα'
 
 
-@pytest.fixture
-def uc_empty():
-    with tempfile.NamedTemporaryFile(suffix='.jpg', mode="w+b") as fp:
-        fp.write(EMPTY_JPG_DATA)
-        fp.flush()
-        fp.seek(0)
-        yield fp.name
+@pytest.fixture(scope='module')
+def uc_empty(empty_jpg_template, tmp_path_factory):
+    """An image file with no metadata, shared by all the test_add_comment
+       cases.  Each case overwrites the same tag before checking it, so
+       they do not depend on each other.
+    """
+    name = str(tmp_path_factory.mktemp("usercomment") / "empty.jpg")
+    shutil.copyfile(empty_jpg_template, name)
+    return name
 
 
 @pytest.mark.parametrize("value", [
@@ -150,6 +152,23 @@ def test_add_comment(value, uc_empty):
     metadata[key] = value
     metadata.write()
 
+    assert key in metadata.exif_keys
+    tag = metadata[key]
+    assert tag.type == 'Comment'
+    assert tag.value == value
+
+
+def test_write_read_roundtrip(uc_empty):
+    """Check once that a comment written to disk reads back intact;
+       test_add_comment only looks at the in-memory metadata.
+    """
+    key = 'Exif.Photo.UserComment'
+    value = 'déjà vu'
+    metadata = ImageMetadata(uc_empty)
+    metadata.read()
+    metadata[key] = value
+    metadata.write()
+
     metadata = ImageMetadata(uc_empty)
     metadata.read()
     assert key in metadata.exif_keys
@@ -25,11 +25,13 @@
 #
 # ******************************************************************************
 
+import datetime
+
 import pytest
 
 from pyexiv2.utils import (
     undefined_to_string, string_to_undefined, Fraction, is_fraction,
-    make_fraction, fraction_to_string
+    make_fraction, fraction_to_string, _fixed_offset
 )
 
 
@@ -63,12 +65,22 @@ def test_undefined_to_string_oneway(uval, sval):
 @pytest.mark.parametrize("uval", [
     "foo",
     "48 50  50 49",
+    "48 256 50 49",
 ])
 def test_undefined_to_string_invalid(uval):
     with pytest.raises(ValueError):
         undefined_to_string(uval)
 
 
+def test_string_to_undefined_bytes():
+    assert string_to_undefined(b"0221") == "48 50 50 49"
+
+
+def test_string_to_undefined_invalid():
+    with pytest.raises(UnicodeEncodeError):
+        string_to_undefined("\u03c0")
+
+
 @pytest.mark.parametrize("is_f, obj", [
     (True, Fraction()),
     (True, Fraction(3, 5)),
@@ -126,3 +138,10 @@ def test_fraction_to_string_valid(frac, as_str):
 def test_fraction_to_string_invalid(bad_args):
     with pytest.raises(TypeError):
         fraction_to_string(*bad_args)
+
+
+def test_fixed_offset_shared():
+    tz = _fixed_offset('-', 11, 30)
+    assert _fixed_offset('-', 11, 30) is tz
+    assert tz.utcoffset(None) == -datetime.timedelta(hours=11, minutes=30)
+    assert _fixed_offset() is not tz
@@ -27,21 +27,32 @@
 
 import pytest
 
-from pyexiv2.metadata import ImageMetadata
 from pyexiv2.xmp import (
     register_namespace, unregister_namespace, unregister_namespaces
 )
-from .helpers import D, EMPTY_JPG_DATA
+from .helpers import D, registered_ns
+
+# These tests register and unregister namespaces in libexiv2's
+# process-wide XMP registry.  Under pytest-xdist with --dist loadgroup,
+# keep them all on one worker so they see each other's effects in
+# order, and leave the other workers free for the other modules.
+pytestmark = pytest.mark.xdist_group("xmp_ns_registry")
 
 # Dublin Core XML namespace, which is built-in as the 'dc' prefix
 DC_NAME = 'http://purl.org/dc/elements/1.1/'
 
 
+@pytest.fixture(autouse=True)
+def _clean_registry():
+    # A test that fails between registering and unregistering a
+    # namespace must not leak it into the next test.
+    yield
+    unregister_namespaces()
+
+
 @pytest.fixture
-def metadata():
-    m = ImageMetadata.from_buffer(EMPTY_JPG_DATA)
-    m.read()
-    return m
+def metadata(empty_meta):
+    return empty_meta
 
 
 def test_name_must_end_with_slash():
@@ -72,12 +83,9 @@ def test_cannot_register_builtin():
 def test_cannot_register_twice():
     name = 'foobar/'
     prefix = 'boo'
-    register_namespace(name, prefix)
-    try:
+    with registered_ns(name, prefix):
         with pytest.raises(KeyError):
             register_namespace(name, prefix)
-    finally:
-        unregister_namespace(name)
 
 
 def test_cannot_unregister_builtin():
@@ -101,7 +109,7 @@ def test_cannot_unregister_twice():
 
 
 def test_cannot_set_unregistered(metadata):
-    assert len(metadata.xmp_keys) == 0
+    assert metadata.xmp_count() == 0
     key = 'Xmp.foo.bar'
     value = 'foobar'
     with pytest.raises(KeyError):
@@ -109,22 +117,18 @@ def test_cannot_set_unregistered(metadata):
 
 
 def test_register_and_set(metadata):
-    register_namespace('foobar/', 'bar')
-    try:
+    with registered_ns('foobar/', 'bar'):
         key = 'Xmp.bar.foo'
         value = 'foobar'
         metadata[key] = value
         assert key in metadata.xmp_keys
-    finally:
-        unregister_namespace('foobar/')
 
 
 def test_can_only_set_text_values(metadata):
     # At the moment custom namespaces only support setting simple text
     # values.
     key = 'Xmp.far.foo'
-    register_namespace('foobar/', 'far')
-    try:
+    with registered_ns('foobar/', 'far'):
         # array value not supported
         with pytest.raises(NotImplementedError):
             metadata[key] = ['foo', 'bar']
@@ -143,20 +147,14 @@ def test_can_only_set_text_values(metadata):
         metadata[key] = value
         assert metadata[key].raw_value == dt
 
-    finally:
-        unregister_namespace('foobar/')
-
 
 def test_unregister_invalidates_keys_in_ns(metadata):
     name = 'blih/'
     prefix = 'bli'
     key = 'Xmp.' + prefix + '.blu'
-    register_namespace(name, prefix)
-    try:
+    with registered_ns(name, prefix):
         metadata[key] = 'foobar'
         assert key in metadata.xmp_keys
-    finally:
-        unregister_namespace(name)
 
     with pytest.raises(KeyError):
         metadata.write()
@@ -45,21 +45,29 @@ TAG_TEMPLATES = {
 TAG_CACHE = LazyTagCreator(XmpTag, TAG_TEMPLATES)
 INVALID = XmpValueError
 
+# Every URL is also a valid URI.
+_URLS = (
+    'http://example.com',
+    'https://example.com',
+    'http://localhost:8000/resource',
+)
+_URIS = _URLS + ('uuid:9A3B7F52214211DAB6308A7391270C13',)
 
-@pytest.mark.parametrize("tag, to_what, inp, exp", expand_conversions([
-    ('Boolean', 'python', [
+
+_SIMPLE_CASES = (
+    ('Boolean', 'python', (
         ('True', True),
         ('False', False),
         ('invalid', INVALID),
         (None, INVALID),
-    ]),
-    ('Boolean', 'string', [
+    )),
+    ('Boolean', 'string', (
         (True, 'True'),
         (False, 'False'),
         ('invalid', INVALID),
         (None, INVALID),
-    ]),
-    ('Date', 'python', [
+    )),
+    ('Date', 'python', (
         ('1999', D(1999, 1, 1)),
         ('1999-10', D(1999, 10, 1)),
         ('1999-10-13', D(1999, 10, 13)),
@@ -87,6 +95,12 @@ INVALID = XmpValueError
             '1999-10-13T05:03:54.721-06:00',
             DT(1999, 10, 13, 5, 3, 54, 721000, ('-', 6, 0))
         ),
+        (
+            '1999-10-13T05:03:54.000249Z',
+            DT(1999, 10, 13, 5, 3, 54, 249, ())
+        ),
+        ('1999-10-13T05:03', DT(1999, 10, 13, 5, 3, tz=None)),
+        ('1999-10-13T05:03:54', DT(1999, 10, 13, 5, 3, 54, tz=None)),
         ('invalid', INVALID),
         ('11/10/1983', INVALID),
         ('-1000', INVALID),
@@ -95,8 +109,9 @@ INVALID = XmpValueError
         ('2009-10-30T25:12Z', INVALID),
         ('2009-10-30T23:67Z', INVALID),
         ('2009-01-22T21', INVALID),
-    ]),
-    ('Date', 'string', [
+        (None, INVALID),
+    )),
+    ('Date', 'string', (
         (D(2009, 2, 4), '2009-02-04'),
         (D(1899, 12, 31), '1899-12-31'),
         (D(1999, 10, 13), '1999-10-13'),
@@ -139,10 +154,13 @@ INVALID = XmpValueError
             DT(1899, 12, 31, 23, 59, 59, 124300, tz=('+', 5, 30)),
             '1899-12-31T23:59:59.1243+05:30'
         ),
+        (DT(1999, 10, 13, 5, 3, 27, 1), '1999-10-13T05:03:27.000001Z'),
+        (DT(1999, 10, 13, 5, 3, 27, 10), '1999-10-13T05:03:27.00001Z'),
+        (DT(1999, 10, 13, 5, 3, 27, 999999), '1999-10-13T05:03:27.999999Z'),
         ('invalid', INVALID),
         (None, INVALID),
-    ]),
-    ('Integer', 'python', [
+    )),
+    ('Integer', 'python', (
         ('23', 23),
         ('+5628', 5628),
         ('-4', -4),
@@ -150,139 +168,160 @@ INVALID = XmpValueError
         ('5,64', INVALID),
         ('47.0001', INVALID),
         ('1E3', INVALID),
-    ]),
-    ('Integer', 'string', [
+    )),
+    ('Integer', 'string', (
         (123, '123'),
         (-57, '-57'),
         ('invalid', INVALID),
         (3.14, INVALID),
-    ]),
-    ('MIMEType', 'python', [
+    )),
+    ('MIMEType', 'python', (
         ('image/jpeg', ('image', 'jpeg')),
         ('video/ogg', ('video', 'ogg')),
         ('invalid', INVALID),
         ('image-jpeg', INVALID),
-    ]),
-    ('MIMEType', 'string', [
+    )),
+    ('MIMEType', 'string', (
         (('image', 'jpeg'), 'image/jpeg'),
         (('video', 'ogg'), 'video/ogg'),
         ('invalid', INVALID),
         (('image', ), INVALID),
-    ]),
-    ('ProperName', 'python', [
+    )),
+    ('ProperName', 'python', (
         ('Gérard', 'Gérard'),
         ('Python Software Foundation', 'Python Software Foundation'),
         (None, INVALID),
-    ]),
-    ('ProperName', 'string', [
+    )),
+    ('ProperName', 'string', (
         ('Gérard', b'G\xc3\xa9rard'),
         ('Python Software Foundation', b'Python Software Foundation'),
         (None, INVALID),
-    ]),
-    ('Text', 'python', [
+    )),
+    ('Text', 'python', (
         ('Some text.', 'Some text.'),
         (
             b'Some text with exotic ch\xc3\xa0r\xc3\xa4ct\xc3\xa9r\xca\x90.',
             'Some text with exotic chàräctérʐ.'
         ),
+        (b'Not UTF-8: \xff', INVALID),
         (None, INVALID),
-    ]),
-    ('Text', 'string', [
+    )),
+    ('Text', 'string', (
         ('Some text', b'Some text'),
         (
             'Some text with exotic chàräctérʐ.',
             b'Some text with exotic ch\xc3\xa0r\xc3\xa4ct\xc3\xa9r\xca\x90.'
         ),
         (None, INVALID),
-    ]),
-    ('URI', 'python', [
-        ('http://example.com', 'http://example.com'),
-        ('https://example.com', 'https://example.com'),
-        ('http://localhost:8000/resource', 'http://localhost:8000/resource'),
-        (
-            'uuid:9A3B7F52214211DAB6308A7391270C13',
-            'uuid:9A3B7F52214211DAB6308A7391270C13'
-        ),
-        (None, INVALID),
-    ]),
-    ('URI', 'string', [
-        ('http://example.com', b'http://example.com'),
-        ('https://example.com', b'https://example.com'),
-        ('http://localhost:8000/resource', b'http://localhost:8000/resource'),
-        (
-            'uuid:9A3B7F52214211DAB6308A7391270C13',
-            b'uuid:9A3B7F52214211DAB6308A7391270C13'
-        ),
-        (None, INVALID),
-    ]),
-    ('URL', 'python', [
-        ('http://example.com', 'http://example.com'),
-        ('https://example.com', 'https://example.com'),
-        (
-            'http://localhost:8000/resource',
-            'http://localhost:8000/resource'
-        ),
-        (None, INVALID),
-    ]),
-    ('URL', 'string', [
-        ('http://example.com', b'http://example.com'),
-        ('https://example.com', b'https://example.com'),
-        ('http://localhost:8000/resource', b'http://localhost:8000/resource'),
-        (None, INVALID),
-    ]),
-    ('Rational', 'python', [
+    )),
+    ('URI', 'python', tuple(
+        (uri, uri) for uri in _URIS
+    ) + ((None, INVALID),)),
+    ('URI', 'string', tuple(
+        (uri, uri.encode('ascii')) for uri in _URIS
+    ) + ((None, INVALID),)),
+    ('URL', 'python', tuple(
+        (url, url) for url in _URLS
+    ) + ((None, INVALID),)),
+    ('URL', 'string', tuple(
+        (url, url.encode('ascii')) for url in _URLS
+    ) + ((None, INVALID),)),
+    ('Rational', 'python', (
         ('5/3', FR(5, 3)),
         ('-5/3', FR(-5, 3)),
         ('invalid', INVALID),
         ('5 / 3', INVALID),
         ('5/-3', INVALID),
-    ]),
-    ('Rational', 'string', [
+    )),
+    ('Rational', 'string', (
         (FR(5, 3), '5/3'),
         (FR(-5, 3), '-5/3'),
         ('invalid', INVALID),
         (5 / 3, INVALID),  # float
-    ]),
+    )),
     # TODO: other types
-]))
-def test_simple_conversion(tag, to_what, inp, exp):
-    tag = TAG_CACHE[tag]
-    if to_what == 'python':
-        conv = tag._convert_to_python
-    else:
-        conv = tag._convert_to_string
+)
+_SIMPLE_PARAMS = list(expand_conversions(_SIMPLE_CASES))
+_SIMPLE_IDS = [
+    '%s-%s-%d' % (tag, to_what, i)
+    for i, (tag, to_what, _, _) in enumerate(_SIMPLE_PARAMS)
+]
+
+
+def check_conversion(tag, to_what, inp, exp, type_):
+    # to_what is 'python' or 'string', naming the conversion method.
+    conv = getattr(tag, '_convert_to_' + to_what)
     if exp is INVALID:
         with pytest.raises(INVALID):
-            conv(inp, tag.type)
+            conv(inp, type_)
     else:
-        assert conv(inp, tag.type) == exp
+        assert conv(inp, type_) == exp
 
 
-@pytest.mark.parametrize("tag, to_what, inp, exp", expand_conversions([
-    ('Subject', 'python', [
+@pytest.mark.parametrize(
+    "tag, to_what, inp, exp", _SIMPLE_PARAMS, ids=_SIMPLE_IDS
+)
+def test_simple_conversion(tag, to_what, inp, exp):
+    tag = TAG_CACHE[tag]
+    check_conversion(tag, to_what, inp, exp, tag.type)
+
+
+@pytest.mark.parametrize(
+    "tag, cases",
+    [(tag, cases) for tag, to_what, cases in _SIMPLE_CASES
+     if to_what == 'python']
+)
+def test_many_conversion(tag, cases):
+    # All the valid raw values of a type, converted in one batch.
+    tag = TAG_CACHE[tag]
+    valid = [(inp, exp) for inp, exp in cases if exp is not INVALID]
+    assert tag._convert_many_to_python(
+        [inp for inp, _ in valid], tag.type
+    ) == [exp for _, exp in valid]
+
+
+def test_many_conversion_invalid():
+    tag = TAG_CACHE['Integer']
+    with pytest.raises(XmpValueError) as excinfo:
+        tag._convert_many_to_python(['1', 'abc', '3'], tag.type)
+    assert excinfo.value.value == 'abc'
+
+
+def test_many_conversion_not_implemented():
+    # An empty array converts to an empty list even when its type has
+    # no converter yet, e.g. an empty 'bag Locale' such as Xmp.dc.language.
+    tag = TAG_CACHE['Integer']
+    assert tag._convert_many_to_python([], 'Locale') == []
+    with pytest.raises(NotImplementedError):
+        tag._convert_many_to_python(['en-US'], 'Locale')
+
+
+_BAG_CASES = (
+    ('Subject', 'python', (
         ('', ''),
         ('One value only', 'One value only'),
-    ]),
-    ('Subject', 'string', [
+    )),
+    ('Subject', 'string', (
         ('', b''),
         ('One value only', b'One value only'),
         ([1, 2, 3], INVALID),
-    ]),
-]))
+    )),
+)
+_BAG_PARAMS = list(expand_conversions(_BAG_CASES))
+_BAG_IDS = [
+    '%s-%s-%d' % (tag, to_what, i)
+    for i, (tag, to_what, _, _) in enumerate(_BAG_PARAMS)
+]
+
+
+@pytest.mark.parametrize(
+    "tag, to_what, inp, exp", _BAG_PARAMS, ids=_BAG_IDS
+)
 def test_bag_conversion(tag, to_what, inp, exp):
     # The difference between simple conversion and bag conversion is that
     # the second argument to conv() is not the same as tag.type.  Currently
     # we only test bag conversion cases where the second argument is 'Text'.
-    tag = TAG_CACHE[tag]
-    if to_what == 'python':
-        conv = tag._convert_to_python
-    else:
-        conv = tag._convert_to_string
-    if exp is INVALID:
-        with pytest.raises(INVALID):
-            conv(inp, 'Text')
-    else:
-        assert conv(inp, 'Text') == exp
+    check_conversion(TAG_CACHE[tag], to_what, inp, exp, 'Text')
 
 
 def test_set_value():